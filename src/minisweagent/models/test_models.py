@@ -13,19 +13,18 @@ from minisweagent.models.utils.actions_toolcall_response import (
 from minisweagent.models.utils.openai_multimodal import expand_multimodal_content
 
 
-def make_output(content: str, actions: list[dict], cost: float = 1.0) -> dict:
+def make_output(content: str, actions: list[dict], cost: float | None = None) -> dict:
     """Helper to create an output dict for DeterministicModel.
 
     Args:
         content: The response content string
         actions: List of action dicts, e.g., [{"command": "echo hello"}]
-        cost: Cost to report for this output (default 1.0)
+        cost: Cost to report for this output (default: the model's `cost_per_call`)
     """
-    return {
-        "role": "assistant",
-        "content": content,
-        "extra": {"actions": actions, "cost": cost, "timestamp": time.time()},
-    }
+    extra = {"actions": actions, "timestamp": time.time()}
+    if cost is not None:
+        extra["cost"] = cost
+    return {"role": "assistant", "content": content, "extra": extra}
 
 
 def make_toolcall_output(content: str | None, tool_calls: list[dict], actions: list[dict]) -> dict:
@@ -40,7 +39,7 @@ def make_toolcall_output(content: str | None, tool_calls: list[dict], actions: l
         "role": "assistant",
         "content": content,
         "tool_calls": tool_calls,
-        "extra": {"actions": actions, "cost": 1.0, "timestamp": time.time()},
+        "extra": {"actions": actions, "timestamp": time.time()},
     }
 
 
@@ -68,10 +67,17 @@ def make_response_api_output(content: str | None, actions: list[dict]) -> dict:
     return {
         "object": "response",
         "output": output_items,
-        "extra": {"actions": actions, "cost": 1.0, "timestamp": time.time()},
+        "extra": {"actions": actions, "timestamp": time.time()},
     }
 
 
+def _with_cost(output: dict, cost: float) -> dict:
+    """Report the cost of a query on the returned message, like the real models do.
+    A cost already set on the configured output takes precedence.
+    """
+    return output | {"extra": {"cost": cost} | output.get("extra", {})}
+
+
 def _process_test_actions(actions: list[dict]) -> bool:
     """Process special test actions. Returns True if the query should be retried."""
     for action in actions:
@@ -112,8 +118,9 @@ class DeterministicModel:
         output = self.config.outputs[self.current_index]
         if _process_test_actions(output.get("extra", {}).get("actions", [])):
             return self.query(messages, **kwargs)
-        GLOBAL_MODEL_STATS.add(self.config.cost_per_call)
-        return output
+        message = _with_cost(output, self.config.cost_per_call)
+        GLOBAL_MODEL_STATS.add(message["extra"]["cost"])
+        return message
 
     def format_message(self, **kwargs) -> dict:
         return expand_multimodal_content(kwargs, pattern=self.config.multimodal_regex)
@@ -168,8 +175,9 @@ class DeterministicToolcallModel:
         output = self.config.outputs[self.current_index]
         if _process_test_actions(output.get("extra", {}).get("actions", [])):
             return self.query(messages, **kwargs)
-        GLOBAL_MODEL_STATS.add(self.config.cost_per_call)
-        return output
+        message = _with_cost(output, self.config.cost_per_call)
+        GLOBAL_MODEL_STATS.add(message["extra"]["cost"])
+        return message
 
     def format_message(self, **kwargs) -> dict:
         return expand_multimodal_content(kwargs, pattern=self.config.multimodal_regex)
@@ -228,8 +236,9 @@ class DeterministicResponseAPIToolcallModel:
         output = self.config.outputs[self.current_index]
         if _process_test_actions(output.get("extra", {}).get("actions", [])):
             return self.query(messages, **kwargs)
-        GLOBAL_MODEL_STATS.add(self.config.cost_per_call)
-        return output
+        message = _with_cost(output, self.config.cost_per_call)
+        GLOBAL_MODEL_STATS.add(message["extra"]["cost"])
+        return message
 
     def format_message(self, **kwargs) -> dict:
         """Format message in Responses API format."""
@@ -1,6 +1,7 @@
 """Utilities for handling multimodal content in OpenAI-style messages."""
 
 import copy
+import functools
 import re
 from typing import Any
 
@@ -9,9 +10,16 @@ DEFAULT_MULTIMODAL_REGEX = (
 )
 
 
-def _expand_content_string(*, content: str, pattern: str) -> list[dict]:
+@functools.cache
+def _compile_pattern(pattern: str) -> re.Pattern:
+    return re.compile(pattern)
+
+
+def _expand_content_string(*, content: str, pattern: str | re.Pattern) -> list[dict]:
     """Expand a content string, replacing multimodal tags with structured content."""
-    matches = list(re.finditer(pattern, content))
+    if isinstance(pattern, str):
+        pattern = _compile_pattern(pattern)
+    matches = list(pattern.finditer(content))
     if not matches:
         return [{"type": "text", "text": content}]
     result = []
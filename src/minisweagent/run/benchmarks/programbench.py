@@ -33,14 +33,13 @@ app = typer.Typer(rich_markup_mode="rich", add_completion=False)
 class ProgramBenchAgent(ProgressTrackingAgent):
     """Drops ``raw_output`` from tool-result messages to avoid bloating trajectories."""
 
-    def serialize(self, *extra_dicts) -> dict:
-        data = super().serialize(*extra_dicts)
-        for msg in data.get("messages", []):
+    def add_messages(self, *messages: dict) -> list[dict]:
+        for msg in messages:
             extra = msg.get("extra", {})
             extra.pop("raw_output", None)
             for obs in extra.get("observations", []):
                 obs.pop("raw_output", None)
-        return data
+        return super().add_messages(*messages)
 
 
 def copy_submission(env, dest: Path, *, src: str = "/workspace") -> None:
@@ -1,10 +1,9 @@
-from pathlib import Path
+import subprocess
 
 import pytest
-import yaml
 
 from minisweagent.agents.default import DefaultAgent
-from minisweagent.environments.local import LocalEnvironment
+from minisweagent.environments import local
 from minisweagent.exceptions import FormatError
 from minisweagent.models import GLOBAL_MODEL_STATS
 from minisweagent.models.test_models import (
@@ -57,24 +56,6 @@ def is_observation_message(msg: dict) -> bool:
 # --- Fixtures ---
 
 
-@pytest.fixture
-def default_config():
-    """Load default agent config from config/default.yaml"""
-    config_path = Path("src/minisweagent/config/default.yaml")
-    with open(config_path) as f:
-        config = yaml.safe_load(f)
-    return config["agent"]
-
-
-@pytest.fixture
-def toolcall_config():
-    """Load toolcall agent config from config/mini.yaml"""
-    config_path = Path("src/minisweagent/config/mini.yaml")
-    with open(config_path) as f:
-        config = yaml.safe_load(f)
-    return config["agent"]
-
-
 def make_text_model(outputs_spec: list[tuple[str, list[dict]]], **kwargs) -> DeterministicModel:
     """Create a DeterministicModel from a list of (content, actions) tuples."""
     return DeterministicModel(outputs=[make_output(content, actions) for content, actions in outputs_spec], **kwargs)
@@ -128,63 +109,97 @@ def model_factory(request, default_config, toolcall_config):
 # --- Tests ---
 
 
-def test_successful_completion(model_factory):
-    """Test agent completes successfully when COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT is encountered."""
-    factory, config = model_factory
-    agent = DefaultAgent(
-        model=factory(
+_SUBMIT = "echo 'COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT'\n"
+
+
+@pytest.mark.parametrize(
+    ("outputs", "model_kwargs", "config_overrides", "exit_status", "submission", "n_calls"),
+    [
+        (
             [
                 ("I'll echo a message", [{"command": "echo 'hello world'"}]),
-                (
-                    "Now finishing",
-                    [{"command": "echo 'COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT'\necho 'Task completed successfully'"}],
-                ),
-            ]
+                ("Now finishing", [{"command": _SUBMIT + "echo 'Task completed successfully'"}]),
+            ],
+            {},
+            {},
+            "Submitted",
+            "Task completed successfully\n",
+            2,
         ),
-        env=LocalEnvironment(),
-        **config,
-    )
-
-    info = agent.run("Echo hello world then finish")
-    assert info["exit_status"] == "Submitted"
-    assert info["submission"] == "Task completed successfully\n"
-    assert agent.n_calls == 2
-
-
-def test_step_limit_enforcement(model_factory):
-    """Test agent stops when step limit is reached."""
-    factory, config = model_factory
-    agent = DefaultAgent(
-        model=factory(
+        (
             [
                 ("First command", [{"command": "echo 'step1'"}]),
                 ("Second command", [{"command": "echo 'step2'"}]),
-            ]
+            ],
+            {},
+            {"step_limit": 1},
+            "LimitsExceeded",
+            "",
+            1,
         ),
-        env=LocalEnvironment(),
-        **{**config, "step_limit": 1},
-    )
+        (
+            [("Test", [{"command": "echo 'test'"}])],
+            {},
+            {"cost_limit": 0.5},
+            "LimitsExceeded",
+            "",
+            1,
+        ),
+        (
+            [
+                ("Step 1", [{"command": "echo 'first'"}]),
+                ("Step 2", [{"command": "echo 'second'"}]),
+                ("Step 3", [{"command": "echo 'third'"}]),
+                ("Final step", [{"command": _SUBMIT + "echo 'completed all steps'"}]),
+            ],
+            {"cost_per_call": 0.0},
+            {},
+            "Submitted",
+            "completed all steps\n",
+            4,
+        ),
+        (
+            [
+                ("No actions here", []),  # Empty actions list
+                ("Now with action", [{"command": _SUBMIT + "echo 'done'"}]),
+            ],
+            {},
+            {},
+            "Submitted",
+            "done\n",
+            2,
+        ),
+    ],
+    ids=["successful_completion", "step_limit", "cost_limit", "multiple_steps", "empty_actions"],
+)
+def test_run_exit_status(
+    model_factory, local_env, outputs, model_kwargs, config_overrides, exit_status, submission, n_calls
+):
+    """Test that runs end with the expected exit status, submission and number of model calls."""
+    factory, config = model_factory
+    agent = DefaultAgent(model=factory(outputs, **model_kwargs), env=local_env, **{**config, **config_overrides})
 
-    info = agent.run("Run multiple commands")
-    assert info["exit_status"] == "LimitsExceeded"
-    assert agent.n_calls == 1
+    info = agent.run("Test task")
+    assert info["exit_status"] == exit_status
+    assert info["submission"] == submission
+    assert agent.n_calls == n_calls
 
 
-def test_cost_limit_enforcement(model_factory):
-    """Test agent stops when cost limit is reached."""
-    factory, config = model_factory
-    agent = DefaultAgent(
-        model=factory([("Test", [{"command": "echo 'test'"}])]),
-        env=LocalEnvironment(),
-        **{**config, "cost_limit": 0.5},
-    )
+def _timeout_on_sleep(partial_output: str | bytes = ""):
+    """Stand-in for `local._run` that times out `sleep` commands immediately instead of waiting for the timeout."""
+    run = local._run
 
-    info = agent.run("Test cost limit")
-    assert info["exit_status"] == "LimitsExceeded"
+    def _run(command: str, cwd: str, env: dict[str, str], timeout: int):
+        if "sleep" in command:
+            raise subprocess.TimeoutExpired(command, timeout, output=partial_output)
+        return run(command, cwd, env, timeout)
+
+    return _run
 
 
-def test_timeout_handling(model_factory):
+def test_timeout_handling(model_factory, local_env, monkeypatch):
     """Test agent handles command timeouts properly."""
+    monkeypatch.setattr(local, "_run", _timeout_on_sleep())
     factory, config = model_factory
     agent = DefaultAgent(
         model=factory(
@@ -193,7 +208,7 @@ def test_timeout_handling(model_factory):
                 ("Quick finish", [{"command": "echo 'COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT'\necho 'recovered'"}]),
             ]
         ),
-        env=LocalEnvironment(timeout=1),  # Very short timeout
+        env=local_env,
         **config,
     )
 
@@ -205,20 +220,19 @@ def test_timeout_handling(model_factory):
     assert len(timed_out) == 1
 
 
-def test_timeout_captures_partial_output(model_factory):
+@pytest.mark.parametrize("partial_output", ["999\n", b"999\n"])
+def test_timeout_captures_partial_output(model_factory, local_env, monkeypatch, partial_output):
     """Test that timeout error captures partial output from commands that produce output before timing out."""
+    monkeypatch.setattr(local, "_run", _timeout_on_sleep(partial_output))
     factory, config = model_factory
-    num1, num2 = 111, 9
-    calculation_command = f"echo $(({num1}*{num2})); sleep 10"
-    expected_output = str(num1 * num2)
     agent = DefaultAgent(
         model=factory(
             [
-                ("Output then sleep", [{"command": calculation_command}]),
+                ("Output then sleep", [{"command": "echo $((111*9)); sleep 10"}]),
                 ("Quick finish", [{"command": "echo 'COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT'\necho 'recovered'"}]),
             ]
         ),
-        env=LocalEnvironment(timeout=1),
+        env=local_env,
         **config,
     )
     info = agent.run("Test timeout with partial output")
@@ -226,35 +240,10 @@ def test_timeout_captures_partial_output(model_factory):
     assert info["submission"] == "recovered\n"
     timed_out = [msg for msg in agent.messages if "timed out" in get_observation_text(msg)]
     assert len(timed_out) == 1
-    assert expected_output in get_observation_text(timed_out[0])
-
-
-def test_multiple_steps_before_completion(model_factory):
-    """Test agent can handle multiple steps before finding completion signal."""
-    factory, config = model_factory
-    agent = DefaultAgent(
-        model=factory(
-            [
-                ("Step 1", [{"command": "echo 'first'"}]),
-                ("Step 2", [{"command": "echo 'second'"}]),
-                ("Step 3", [{"command": "echo 'third'"}]),
-                (
-                    "Final step",
-                    [{"command": "echo 'COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT'\necho 'completed all steps'"}],
-                ),
-            ]
-        ),
-        env=LocalEnvironment(),
-        **{**config, "cost_limit": 5.0},  # Increase cost limit to allow all 4 calls
-    )
-
-    info = agent.run("Multi-step task")
-    assert info["exit_status"] == "Submitted"
-    assert info["submission"] == "completed all steps\n"
-    assert agent.n_calls == 4
+    assert "999" in get_observation_text(timed_out[0])
 
 
-def test_custom_config(model_factory):
+def test_custom_config(model_factory, local_env):
     """Test agent works with custom configuration."""
     factory, config = model_factory
     agent = DefaultAgent(
@@ -266,7 +255,7 @@ def test_custom_config(model_factory):
                 )
             ]
         ),
-        env=LocalEnvironment(),
+        env=local_env,
         **{
             **config,
             "system_template": "You are a test assistant.",
@@ -283,7 +272,7 @@ def test_custom_config(model_factory):
     assert "Test custom config" in get_text(agent.messages[1])
 
 
-def test_render_template_model_stats(model_factory):
+def test_render_template_model_stats(model_factory, local_env):
     """Test that render_template has access to n_model_calls and model_cost from agent."""
     factory, config = model_factory
     agent = DefaultAgent(
@@ -293,7 +282,7 @@ def test_render_template_model_stats(model_factory):
                 ("Test 2", [{"command": "echo 'test2'"}]),
             ]
         ),
-        env=LocalEnvironment(),
+        env=local_env,
         **config,
     )
 
@@ -307,7 +296,7 @@ def test_render_template_model_stats(model_factory):
     assert agent._render_template(template) == "Calls: 2, Cost: 2.0"
 
 
-def test_messages_include_timestamps(model_factory):
+def test_messages_include_timestamps(model_factory, local_env):
     """Test that assistant and observation messages include timestamps."""
     factory, config = model_factory
     agent = DefaultAgent(
@@ -317,21 +306,21 @@ def test_messages_include_timestamps(model_factory):
                 ("Response 2", [{"command": "echo 'COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT'\necho 'done'"}]),
             ]
         ),
-        env=LocalEnvironment(),
+        env=local_env,
         **config,
     )
 
     agent.run("Test timestamps")
 
-    # Assistant messages should have timestamps
     assistant_msgs = [msg for msg in agent.messages if is_assistant_message(msg)]
-    assert all("timestamp" in msg.get("extra", {}) for msg in assistant_msgs)
-    # Timestamps should be numeric (floats from time.time())
-    all_timestamped = [msg for msg in agent.messages if "timestamp" in msg.get("extra", {})]
-    assert all(isinstance(msg["extra"]["timestamp"], float) for msg in all_timestamped)
+    observation_msgs = [msg for msg in agent.messages if is_observation_message(msg)]
+    assert assistant_msgs
+    assert observation_msgs
+    # Timestamps should be floats from time.time()
+    assert all(isinstance(msg["extra"]["timestamp"], float) for msg in assistant_msgs + observation_msgs)
 
 
-def test_message_history_tracking(model_factory):
+def test_message_history_tracking(model_factory, local_env):
     """Test that messages are properly added and tracked."""
     factory, config = model_factory
     agent = DefaultAgent(
@@ -341,7 +330,7 @@ def test_message_history_tracking(model_factory):
                 ("Response 2", [{"command": "echo 'COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT'\necho 'done'"}]),
             ]
         ),
-        env=LocalEnvironment(),
+        env=local_env,
         **config,
     )
 
@@ -362,12 +351,12 @@ def test_message_history_tracking(model_factory):
     assert is_assistant_message(agent.messages[4])
 
 
-def test_step_adds_messages(model_factory):
+def test_step_adds_messages(model_factory, local_env):
     """Test that step adds assistant and observation messages."""
     factory, config = model_factory
     agent = DefaultAgent(
         model=factory([("Test command", [{"command": "echo 'hello'"}])]),
-        env=LocalEnvironment(),
+        env=local_env,
         **config,
     )
 
@@ -385,7 +374,7 @@ def test_step_adds_messages(model_factory):
     assert "returncode" in get_observation_text(agent.messages[-1])
 
 
-def test_observations_captured(model_factory):
+def test_observations_captured(model_factory, local_env):
     """Test intermediate outputs are captured correctly."""
     factory, config = model_factory
     agent = DefaultAgent(
@@ -394,10 +383,11 @@ def test_observations_captured(model_factory):
                 ("Step 1", [{"command": "echo 'first'"}]),
                 ("Step 2", [{"command": "echo 'second'"}]),
                 ("Final", [{"command": "echo 'COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT'\necho 'done'"}]),
-            ]
+            ],
+            cost_per_call=0.0,
         ),
-        env=LocalEnvironment(),
-        **{**config, "cost_limit": 5.0},
+        env=local_env,
+        **config,
     )
 
     agent.run("Multi-step task")
@@ -407,7 +397,7 @@ def test_observations_captured(model_factory):
     assert "second" in observations[1]
 
 
-def test_wall_time_limit_enforcement(model_factory):
+def test_wall_time_limit_enforcement(model_factory, local_env):
     """Test agent stops when wall-clock time limit is reached."""
     factory, config = model_factory
     agent = DefaultAgent(
@@ -417,7 +407,7 @@ def test_wall_time_limit_enforcement(model_factory):
                 ("Should not run", [{"command": "echo 'unreachable'"}]),
             ]
         ),
-        env=LocalEnvironment(),
+        env=local_env,
         **{**config, "wall_time_limit_seconds": 1},
     )
 
@@ -426,12 +416,12 @@ def test_wall_time_limit_enforcement(model_factory):
     assert agent.n_calls == 1
 
 
-def test_wall_time_limit_template_vars(model_factory):
+def test_wall_time_limit_template_vars(model_factory, local_env):
     """Test that elapsed_seconds and wall_time_limit_seconds are available as template vars."""
     factory, config = model_factory
     agent = DefaultAgent(
         model=factory([("Test", [{"command": "echo 'test'"}])]),
-        env=LocalEnvironment(),
+        env=local_env,
         **{**config, "wall_time_limit_seconds": 3600},
     )
     agent.add_messages({"role": "system", "content": "test"}, {"role": "user", "content": "test"})
@@ -440,26 +430,6 @@ def test_wall_time_limit_template_vars(model_factory):
     assert tvars["wall_time_limit_seconds"] == 3600
 
 
-def test_empty_actions_handling(model_factory):
-    """Test agent handles empty actions (continues without error)."""
-    factory, config = model_factory
-    agent = DefaultAgent(
-        model=factory(
-            [
-                ("No actions here", []),  # Empty actions list
-                ("Now with action", [{"command": "echo 'COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT'\necho 'done'"}]),
-            ]
-        ),
-        env=LocalEnvironment(),
-        **config,
-    )
-
-    info = agent.run("Test empty actions")
-    assert info["exit_status"] == "Submitted"
-    assert info["submission"] == "done\n"
-    assert agent.n_calls == 2
-
-
 class _FlakyToolcallModel(DeterministicToolcallModel):
     """Like DeterministicToolcallModel, but raises FormatError (as the real LitellmModel now does
     on a truncated / no-tool-call turn) for any output marked {"_format_error": True}."""
@@ -478,14 +448,14 @@ class _FlakyToolcallModel(DeterministicToolcallModel):
         return output
 
 
-def test_repeated_format_errors_terminate_cleanly(toolcall_config):
+def test_repeated_format_errors_terminate_cleanly(toolcall_config, local_env):
     """With max_consecutive_format_errors set, a run that keeps producing no-tool-call / truncation
     turns stops cleanly with exit_status=RepeatedFormatError instead of looping until the budget is
     gone."""
     outputs = [{"_format_error": True} for _ in range(5)]
     agent = DefaultAgent(
         model=_FlakyToolcallModel(outputs=outputs),
-        env=LocalEnvironment(),
+        env=local_env,
         **{**toolcall_config, "max_consecutive_format_errors": 2},
     )
     info = agent.run("Test repeated format errors")
@@ -493,7 +463,7 @@ def test_repeated_format_errors_terminate_cleanly(toolcall_config):
     assert agent.n_calls == 2  # stopped at the 2nd consecutive error, didn't burn all 5
 
 
-def test_format_error_counter_resets_on_success(toolcall_config):
+def test_format_error_counter_resets_on_success(toolcall_config, local_env):
     """A successful tool call between format errors resets the consecutive counter, so isolated
     errors don't accumulate to the termination threshold."""
     good = make_tc_model([("listing", [{"command": "echo hello"}])]).config.outputs[0]
@@ -504,7 +474,7 @@ def test_format_error_counter_resets_on_success(toolcall_config):
     outputs = [{"_format_error": True}, good, {"_format_error": True}, submit]
     agent = DefaultAgent(
         model=_FlakyToolcallModel(outputs=outputs),
-        env=LocalEnvironment(),
+        env=local_env,
         **{**toolcall_config, "max_consecutive_format_errors": 2},
     )
     info = agent.run("Test counter reset")
@@ -527,13 +497,13 @@ class _BilledFormatErrorModel(DeterministicToolcallModel):
         )
 
 
-def test_format_errors_count_against_cost_limit(toolcall_config, reset_global_stats):
+def test_format_errors_count_against_cost_limit(toolcall_config, reset_global_stats, local_env):
     """Turns that fail to parse are still billed, so they have to count against cost_limit.
     step_limit is only a backstop here: if the format-error path stopped charging, the run would
     run on to that limit with agent.cost still at zero."""
     agent = DefaultAgent(
         model=_BilledFormatErrorModel(outputs=[], cost_per_call=1.0),
-        env=LocalEnvironment(),
+        env=local_env,
         **{**toolcall_config, "cost_limit": 2.5, "step_limit": 8, "max_consecutive_format_errors": 0},
     )
 
@@ -1,9 +1,7 @@
 from contextlib import contextmanager
-from pathlib import Path
 from unittest.mock import patch
 
 import pytest
-import yaml
 
 from minisweagent.agents.interactive import InteractiveAgent
 from minisweagent.environments.local import LocalEnvironment
@@ -101,24 +99,6 @@ def _make_model(outputs: list[tuple[str, list[dict]]], **kwargs) -> Deterministi
 # --- Fixtures ---
 
 
-@pytest.fixture
-def default_config():
-    """Load default agent config from config/default.yaml"""
-    config_path = Path("src/minisweagent/config/default.yaml")
-    with open(config_path) as f:
-        config = yaml.safe_load(f)
-    return config["agent"]
-
-
-@pytest.fixture
-def toolcall_config():
-    """Load toolcall agent config from config/mini.yaml"""
-    config_path = Path("src/minisweagent/config/mini.yaml")
-    with open(config_path) as f:
-        config = yaml.safe_load(f)
-    return config["agent"]
-
-
 @pytest.fixture(params=["text", "toolcall", "response_api"])
 def model_factory(request, default_config, toolcall_config):
     """Parametrized fixture that returns (factory_fn, config) for all three model types."""
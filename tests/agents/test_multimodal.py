@@ -1,3 +1,5 @@
+import re
+
 import pytest
 
 from minisweagent.models.utils.openai_multimodal import (
@@ -26,28 +28,25 @@ from minisweagent.models.utils.openai_multimodal import (
             "<MSWEA_MULTIMODAL_CONTENT><CONTENT_TYPE>image_url</CONTENT_TYPE>data:image/png;base64,iVBORw0KGgoAAAANS</MSWEA_MULTIMODAL_CONTENT>",
             [{"type": "image_url", "image_url": {"url": "data:image/png;base64,iVBORw0KGgoAAAANS"}}],
         ),
+        (
+            "First <MSWEA_MULTIMODAL_CONTENT><CONTENT_TYPE>image_url</CONTENT_TYPE>image1.png</MSWEA_MULTIMODAL_CONTENT> "
+            "middle <MSWEA_MULTIMODAL_CONTENT><CONTENT_TYPE>image_url</CONTENT_TYPE>image2.jpg</MSWEA_MULTIMODAL_CONTENT> end",
+            [
+                {"type": "text", "text": "First "},
+                {"type": "image_url", "image_url": {"url": "image1.png"}},
+                {"type": "text", "text": " middle "},
+                {"type": "image_url", "image_url": {"url": "image2.jpg"}},
+                {"type": "text", "text": " end"},
+            ],
+        ),
     ],
+    ids=["plain", "single_url", "base64", "two_urls"],
 )
 def test_expand_content_string(content, expected):
     """Test _expand_content_string with various content patterns."""
     assert _expand_content_string(content=content, pattern=DEFAULT_MULTIMODAL_REGEX) == expected
 
 
-def test_expand_content_string_multiple_images():
-    """Test _expand_content_string with multiple images."""
-    content = (
-        "First <MSWEA_MULTIMODAL_CONTENT><CONTENT_TYPE>image_url</CONTENT_TYPE>image1.png</MSWEA_MULTIMODAL_CONTENT> "
-        "middle <MSWEA_MULTIMODAL_CONTENT><CONTENT_TYPE>image_url</CONTENT_TYPE>image2.jpg</MSWEA_MULTIMODAL_CONTENT> end"
-    )
-    result = _expand_content_string(content=content, pattern=DEFAULT_MULTIMODAL_REGEX)
-    assert len(result) == 5
-    assert result[0] == {"type": "text", "text": "First "}
-    assert result[1] == {"type": "image_url", "image_url": {"url": "image1.png"}}
-    assert result[2] == {"type": "text", "text": " middle "}
-    assert result[3] == {"type": "image_url", "image_url": {"url": "image2.jpg"}}
-    assert result[4] == {"type": "text", "text": " end"}
-
-
 def test_expand_content_string_multiline():
     """Test _expand_content_string handles multiline image content."""
     content = """Here is an image:
@@ -184,3 +183,11 @@ def test_unknown_content_type_ignored():
     assert len(result) == 2
     assert result[0] == {"type": "text", "text": "Text "}
     assert result[1] == {"type": "text", "text": " more"}
+
+
+def test_expand_content_string_accepts_compiled_pattern():
+    """Test that a precompiled pattern gives the same result as its string form."""
+    content = "a <MSWEA_MULTIMODAL_CONTENT><CONTENT_TYPE>image_url</CONTENT_TYPE>img</MSWEA_MULTIMODAL_CONTENT> b"
+    assert _expand_content_string(
+        content=content, pattern=re.compile(DEFAULT_MULTIMODAL_REGEX)
+    ) == _expand_content_string(content=content, pattern=DEFAULT_MULTIMODAL_REGEX)
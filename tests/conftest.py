@@ -1,11 +1,17 @@
+import functools
 import json
 import re
+import shutil
 import subprocess
 import threading
 from pathlib import Path
+from types import MappingProxyType
 
 import pytest
+import yaml
 
+from minisweagent.config import builtin_config_dir
+from minisweagent.environments.local import LocalEnvironment
 from minisweagent.models import GLOBAL_MODEL_STATS
 
 
@@ -19,6 +25,33 @@ def pytest_addoption(parser):
     )
 
 
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@functools.cache
+def _load_agent_config(config_name: str) -> MappingProxyType:
+    """Parse the agent section of a builtin config once per process and return a read-only view of it."""
+    return MappingProxyType(yaml.load((builtin_config_dir / config_name).read_bytes(), Loader=_YAML_LOADER)["agent"])
+
+
+@pytest.fixture(scope="session")
+def default_config():
+    """Load default agent config from config/default.yaml"""
+    return _load_agent_config("default.yaml")
+
+
+@pytest.fixture(scope="session")
+def toolcall_config():
+    """Load toolcall agent config from config/mini.yaml"""
+    return _load_agent_config("mini.yaml")
+
+
+@pytest.fixture(scope="module")
+def local_env():
+    """LocalEnvironment with default settings, shared by all tests of a module (it keeps no per-command state)."""
+    return LocalEnvironment()
+
+
 # Global lock for tests that modify global state - this works across threads
 _global_stats_lock = threading.Lock()
 
@@ -40,9 +73,12 @@ def reset_global_stats():
         GLOBAL_MODEL_STATS._n_calls = 0  # noqa: protected-access
 
 
+@functools.cache
 def _get_container_executable() -> str | None:
     """Return 'docker' or 'podman', whichever is available and running."""
     for exe in ("docker", "podman"):
+        if shutil.which(exe) is None:
+            continue
         try:
             subprocess.run([exe, "version"], capture_output=True, check=True, timeout=5)
             return exe
@@ -67,8 +103,7 @@ def container_executable(monkeypatch):
 def get_test_data(trajectory_name: str) -> dict[str, list[str]]:
     """Load test fixtures from a trajectory JSON file"""
     json_path = Path(__file__).parent / "test_data" / f"{trajectory_name}.traj.json"
-    with json_path.open() as f:
-        trajectory = json.load(f)
+    trajectory = json.loads(json_path.read_bytes())
 
     # Extract model responses (assistant messages, starting from index 2)
     model_responses = []
@@ -87,15 +122,22 @@ def get_test_data(trajectory_name: str) -> dict[str, list[str]]:
     return {"model_responses": model_responses, "expected_observations": expected_observations}
 
 
+# Everything between <args> and </args>, because this contains docker container ids
+_ARGS_RE = re.compile(r"<args>.*?</args>", re.DOTALL)
+# Lines that have root in them, because they tend to appear with times
+_ROOT_LINE_RE = re.compile(r"^.*root root.*$\n?", re.MULTILINE)
+
+
 def normalize_outputs(s: str) -> str:
     """Strip leading/trailing whitespace and normalize internal whitespace"""
-    # Remove everything between <args> and </args>, because this contains docker container ids
-    s = re.sub(r"<args>(.*?)</args>", "", s, flags=re.DOTALL)
-    # Replace all lines that have root in them because they tend to appear with times
-    s = "\n".join(l for l in s.split("\n") if "root root" not in l)
+    s = _ROOT_LINE_RE.sub("", _ARGS_RE.sub("", s))
     return "\n".join(line.rstrip() for line in s.strip().split("\n"))
 
 
+# Expected observations are the same static strings across runs, so normalize each of them only once
+_normalize_expected = functools.cache(normalize_outputs)
+
+
 def assert_observations_match(expected_observations: list[str], messages: list[dict]) -> None:
     """Compare expected observations with actual observations from agent messages
 
@@ -117,20 +159,20 @@ def assert_observations_match(expected_observations: list[str], messages: list[d
 
     for i, (expected_observation, actual_observation) in enumerate(zip(expected_observations, actual_observations)):
         normalized_actual = normalize_outputs(actual_observation)
-        normalized_expected = normalize_outputs(expected_observation)
+        normalized_expected = _normalize_expected(expected_observation)
 
         assert normalized_actual == normalized_expected, (
             f"Step {i + 1} observation mismatch:\nExpected: {repr(normalized_expected)}\nActual: {repr(normalized_actual)}"
         )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def github_test_data():
     """Load GitHub issue test fixtures"""
     return get_test_data("github_issue")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def local_test_data():
     """Load local test fixtures"""
     return get_test_data("local")
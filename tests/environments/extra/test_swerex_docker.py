@@ -1,3 +1,6 @@
+import asyncio
+import functools
+import shutil
 import subprocess
 
 import pytest
@@ -5,8 +8,11 @@ import pytest
 from minisweagent.environments.extra.swerex_docker import SwerexDockerEnvironment
 
 
-def _is_docker_available():
+@functools.cache
+def _is_docker_available() -> bool:
     """Check if Docker (or podman aliased as docker) is available."""
+    if shutil.which("docker") is None:
+        return False
     try:
         subprocess.run(["docker", "version"], capture_output=True, check=True, timeout=5)
         return True
@@ -14,13 +20,20 @@ def _is_docker_available():
         return False
 
 
-@pytest.mark.slow
-@pytest.mark.skipif(not _is_docker_available(), reason="Docker not available (swerex requires docker)")
-def test_swerex_docker_basic_execution():
-    """Test basic command execution in SwerexDockerEnvironment."""
+@pytest.fixture(scope="session")
+def swerex_env():
+    """One container shared by all tests. Docker is probed lazily, so deselected tests never spawn `docker version`."""
+    if not _is_docker_available():
+        pytest.skip("Docker not available (swerex requires docker)")
     env = SwerexDockerEnvironment(image="python:3.11")
+    yield env
+    asyncio.run(env.deployment.stop())
+
 
-    result = env.execute({"command": "echo 'hello world'"})
+@pytest.mark.slow
+def test_swerex_docker_basic_execution(swerex_env):
+    """Test basic command execution in SwerexDockerEnvironment."""
+    result = swerex_env.execute({"command": "echo 'hello world'"})
 
     assert isinstance(result, dict)
     assert "output" in result
@@ -30,12 +43,9 @@ def test_swerex_docker_basic_execution():
 
 
 @pytest.mark.slow
-@pytest.mark.skipif(not _is_docker_available(), reason="Docker not available (swerex requires docker)")
-def test_swerex_docker_command_failure():
+def test_swerex_docker_command_failure(swerex_env):
     """Test that command failures are properly captured in SwerexDockerEnvironment."""
-    env = SwerexDockerEnvironment(image="python:3.11")
-
-    result = env.execute({"command": "exit 1"})
+    result = swerex_env.execute({"command": "exit 1"})
 
     assert isinstance(result, dict)
     assert "output" in result
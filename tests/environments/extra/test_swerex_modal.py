@@ -1,4 +1,4 @@
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import SimpleNamespace
 
 import pytest
 
@@ -8,13 +8,23 @@ from minisweagent.environments.extra.swerex_modal import (
 )
 from minisweagent.exceptions import Submitted
 
+_DEFAULT_CONFIG = SwerexModalEnvironmentConfig(image="python:3.11")
+
 
 def _make_env(**kwargs):
-    """Create a SwerexModalEnvironment with mocked __init__ (no Modal infra)."""
-    with patch.object(SwerexModalEnvironment, "__init__", lambda self, **kw: None):
-        env = SwerexModalEnvironment()
-        env.config = SwerexModalEnvironmentConfig(image="python:3.11", **kwargs)
-        return env
+    """Create a SwerexModalEnvironment without running __init__ (no Modal infra)."""
+    env = SwerexModalEnvironment.__new__(SwerexModalEnvironment)
+    env.config = SwerexModalEnvironmentConfig(image="python:3.11", **kwargs) if kwargs else _DEFAULT_CONFIG
+    return env
+
+
+def _deployment_returning(stdout: str, exit_code: int = 0) -> SimpleNamespace:
+    """Fake deployment whose runtime.execute is a plain coroutine function, so `asyncio.run` needs no AsyncMock."""
+
+    async def execute(command):
+        return SimpleNamespace(stdout=stdout, exit_code=exit_code)
+
+    return SimpleNamespace(runtime=SimpleNamespace(execute=execute))
 
 
 def test_swerex_modal_serialize():
@@ -34,16 +44,7 @@ def test_swerex_modal_execute_accepts_dict_action():
     """Test that execute() accepts v2 dict action format."""
     env = _make_env()
 
-    mock_output = MagicMock()
-    mock_output.stdout = "hello world\n"
-    mock_output.exit_code = 0
-
-    mock_runtime = MagicMock()
-    mock_runtime.execute = AsyncMock(return_value=mock_output)
-
-    mock_deployment = MagicMock()
-    mock_deployment.runtime = mock_runtime
-    env.deployment = mock_deployment
+    env.deployment = _deployment_returning("hello world\n")
 
     result = env.execute({"command": "echo hello world"})
 
@@ -55,16 +56,7 @@ def test_swerex_modal_execute_raises_submitted():
     """Test that execute() raises Submitted when output contains the submission marker."""
     env = _make_env()
 
-    mock_output = MagicMock()
-    mock_output.stdout = "COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT\ndiff --git a/file.py b/file.py\n"
-    mock_output.exit_code = 0
-
-    mock_runtime = MagicMock()
-    mock_runtime.execute = AsyncMock(return_value=mock_output)
-
-    mock_deployment = MagicMock()
-    mock_deployment.runtime = mock_runtime
-    env.deployment = mock_deployment
+    env.deployment = _deployment_returning("COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT\ndiff --git a/file.py b/file.py\n")
 
     with pytest.raises(Submitted) as exc_info:
         env.execute({"command": "echo COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT && git diff"})
@@ -125,11 +125,12 @@ def test_local_environment_stderr_capture():
 
 
 def test_local_environment_timeout():
-    """Test timeout functionality returns structured output instead of raising."""
+    """Test timeout functionality returns structured output (including partial output) instead of raising."""
     env = LocalEnvironment(timeout=1)
 
-    result = env.execute({"command": "sleep 2"})
+    result = env.execute({"command": "echo partial; sleep 2"})
     assert result["returncode"] == -1
+    assert result["output"] == "partial\n"
     assert "timed out" in result["exception_info"]
     assert result["extra"]["exception_type"] == "TimeoutExpired"
 
@@ -0,0 +1,58 @@
+import json
+from dataclasses import dataclass
+
+import pytest
+
+
+@dataclass
+class FakeFunction:
+    name: str
+    arguments: str
+
+
+@dataclass
+class FakeToolCall:
+    id: str
+    function: FakeFunction
+
+
+@dataclass
+class FakeMessage:
+    tool_calls: list[FakeToolCall] | None
+
+    def model_dump(self, **kwargs) -> dict:
+        return {"role": "assistant", "content": None}
+
+
+@dataclass
+class FakeChoice:
+    message: FakeMessage
+    finish_reason: str = "stop"
+
+
+@dataclass
+class FakeLitellmResponse:
+    """Just the parts of a litellm chat completion response that the toolcall models read."""
+
+    choices: list[FakeChoice]
+
+    def model_dump(self, **kwargs) -> dict:
+        return {}
+
+
+@pytest.fixture(scope="session")
+def fake_litellm_response():
+    """Factory for litellm responses from ``(call_id, command)`` bash tool calls (``None`` for no tool calls)."""
+
+    def make(tool_calls: list[tuple[str, str]] | None, *, finish_reason: str = "stop") -> FakeLitellmResponse:
+        calls = None
+        if tool_calls is not None:
+            calls = [
+                FakeToolCall(id=call_id, function=FakeFunction(name="bash", arguments=json.dumps({"command": command})))
+                for call_id, command in tool_calls
+            ]
+        return FakeLitellmResponse(
+            choices=[FakeChoice(message=FakeMessage(tool_calls=calls), finish_reason=finish_reason)]
+        )
+
+    return make
@@ -11,14 +11,10 @@ from minisweagent.models.utils.actions_toolcall import (
 
 
 class TestParseToolcallActions:
-    def test_empty_tool_calls_raises_format_error(self):
+    @pytest.mark.parametrize("tool_calls", [[], None], ids=["empty", "none"])
+    def test_no_tool_calls_raises_format_error(self, tool_calls):
         with pytest.raises(FormatError) as exc_info:
-            parse_toolcall_actions([], format_error_template="{{ error }}")
-        assert "No tool calls found" in exc_info.value.messages[0]["content"]
-
-    def test_none_tool_calls_raises_format_error(self):
-        with pytest.raises(FormatError) as exc_info:
-            parse_toolcall_actions(None, format_error_template="{{ error }}")
+            parse_toolcall_actions(tool_calls, format_error_template="{{ error }}")
         assert "No tool calls found" in exc_info.value.messages[0]["content"]
 
     def test_template_kwargs_exposed_to_format_error_template(self):
@@ -58,32 +54,23 @@ class TestParseToolcallActions:
         assert result[0] == {"command": "cmd0", "tool_call_id": "call_0"}
         assert result[2] == {"command": "cmd2", "tool_call_id": "call_2"}
 
-    def test_unknown_tool_raises_format_error(self):
-        tool_call = MagicMock()
-        tool_call.function.name = "unknown_tool"
-        tool_call.function.arguments = '{"command": "test"}'
-        tool_call.id = "call_1"
-        with pytest.raises(FormatError) as exc_info:
-            parse_toolcall_actions([tool_call], format_error_template="{{ error }}")
-        assert "Unknown tool 'unknown_tool'" in exc_info.value.messages[0]["content"]
-
-    def test_invalid_json_raises_format_error(self):
+    @pytest.mark.parametrize(
+        ("name", "arguments", "expected_error"),
+        [
+            ("unknown_tool", '{"command": "test"}', "Unknown tool 'unknown_tool'"),
+            ("bash", "not valid json", "Error parsing tool call arguments"),
+            ("bash", '{"other_arg": "value"}', "Missing 'command' argument"),
+        ],
+        ids=["unknown_tool", "invalid_json", "missing_command"],
+    )
+    def test_invalid_tool_call_raises_format_error(self, name, arguments, expected_error):
         tool_call = MagicMock()
-        tool_call.function.name = "bash"
-        tool_call.function.arguments = "not valid json"
-        tool_call.id = "call_1"
-        with pytest.raises(FormatError) as exc_info:
-            parse_toolcall_actions([tool_call], format_error_template="{{ error }}")
-        assert "Error parsing tool call arguments" in exc_info.value.messages[0]["content"]
-
-    def test_missing_command_raises_format_error(self):
-        tool_call = MagicMock()
-        tool_call.function.name = "bash"
-        tool_call.function.arguments = '{"other_arg": "value"}'
+        tool_call.function.name = name
+        tool_call.function.arguments = arguments
         tool_call.id = "call_1"
         with pytest.raises(FormatError) as exc_info:
             parse_toolcall_actions([tool_call], format_error_template="{{ error }}")
-        assert "Missing 'command' argument" in exc_info.value.messages[0]["content"]
+        assert expected_error in exc_info.value.messages[0]["content"]
 
 
 class TestFormatToolcallObservationMessages:
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 
@@ -12,64 +12,60 @@ class TestLitellmModelConfig:
         assert LitellmModelConfig(model_name="test").format_error_template == "{{ error }}"
 
 
-def _mock_litellm_response(tool_calls):
-    mock_response = MagicMock()
-    mock_response.choices = [MagicMock()]
-    mock_response.choices[0].message.tool_calls = tool_calls
-    mock_response.choices[0].message.model_dump.return_value = {"role": "assistant", "content": None}
-    mock_response.model_dump.return_value = {}
-    return mock_response
+@pytest.fixture(scope="module")
+def litellm_gpt4():
+    """Default-config model shared by the tests below; LitellmModel keeps no per-query state."""
+    return LitellmModel(model_name="gpt-4")
+
+
+@pytest.fixture(scope="module")
+def obs_template_model():
+    return LitellmModel(model_name="gpt-4", observation_template="{{ output.output }}")
 
 
 class TestLitellmModel:
     @patch("minisweagent.models.litellm_model.litellm.completion")
     @patch("minisweagent.models.litellm_model.litellm.cost_calculator.completion_cost")
-    def test_query_includes_bash_tool(self, mock_cost, mock_completion):
-        tool_call = MagicMock()
-        tool_call.function.name = "bash"
-        tool_call.function.arguments = '{"command": "echo test"}'
-        tool_call.id = "call_1"
-        mock_completion.return_value = _mock_litellm_response([tool_call])
+    def test_query_includes_bash_tool(self, mock_cost, mock_completion, litellm_gpt4, fake_litellm_response):
+        calls = []
+
+        def capture(*args, **kwargs):
+            calls.append(kwargs)
+            return fake_litellm_response([("call_1", "echo test")])
+
+        mock_completion.side_effect = capture
         mock_cost.return_value = 0.001
 
-        model = LitellmModel(model_name="gpt-4")
-        model.query([{"role": "user", "content": "test"}])
+        litellm_gpt4.query([{"role": "user", "content": "test"}])
 
-        mock_completion.assert_called_once()
-        assert mock_completion.call_args.kwargs["tools"] == [BASH_TOOL]
+        assert len(calls) == 1
+        assert len(calls[0]["tools"]) == 1
+        assert calls[0]["tools"][0] is BASH_TOOL
 
     @patch("minisweagent.models.litellm_model.litellm.completion")
     @patch("minisweagent.models.litellm_model.litellm.cost_calculator.completion_cost")
-    def test_parse_actions_valid_tool_call(self, mock_cost, mock_completion):
-        tool_call = MagicMock()
-        tool_call.function.name = "bash"
-        tool_call.function.arguments = '{"command": "ls -la"}'
-        tool_call.id = "call_abc"
-        mock_completion.return_value = _mock_litellm_response([tool_call])
+    def test_parse_actions_valid_tool_call(self, mock_cost, mock_completion, litellm_gpt4, fake_litellm_response):
+        mock_completion.return_value = fake_litellm_response([("call_abc", "ls -la")])
         mock_cost.return_value = 0.001
 
-        model = LitellmModel(model_name="gpt-4")
-        result = model.query([{"role": "user", "content": "list files"}])
+        result = litellm_gpt4.query([{"role": "user", "content": "list files"}])
         assert result["extra"]["actions"] == [{"command": "ls -la", "tool_call_id": "call_abc"}]
 
     @patch("minisweagent.models.litellm_model.litellm.completion")
     @patch("minisweagent.models.litellm_model.litellm.cost_calculator.completion_cost")
-    def test_parse_actions_no_tool_calls_raises(self, mock_cost, mock_completion):
-        mock_completion.return_value = _mock_litellm_response(None)
+    def test_parse_actions_no_tool_calls_raises(self, mock_cost, mock_completion, litellm_gpt4, fake_litellm_response):
+        mock_completion.return_value = fake_litellm_response(None)
         mock_cost.return_value = 0.001
 
-        model = LitellmModel(model_name="gpt-4")
         with pytest.raises(FormatError):
-            model.query([{"role": "user", "content": "test"}])
+            litellm_gpt4.query([{"role": "user", "content": "test"}])
 
     @patch("minisweagent.models.litellm_model.litellm.completion")
     @patch("minisweagent.models.litellm_model.litellm.cost_calculator.completion_cost")
-    def test_finish_reason_threaded_into_format_error_template(self, mock_cost, mock_completion):
+    def test_finish_reason_threaded_into_format_error_template(self, mock_cost, mock_completion, fake_litellm_response):
         """The response finish_reason is exposed to format_error_template via template_kwargs, so a
         config can report a max_tokens truncation instead of the misleading "no tool call" error."""
-        response = _mock_litellm_response(None)
-        response.choices[0].finish_reason = "length"
-        mock_completion.return_value = response
+        mock_completion.return_value = fake_litellm_response(None, finish_reason="length")
         mock_cost.return_value = 0.001
 
         model = LitellmModel(
@@ -80,17 +76,14 @@ class TestLitellmModel:
             model.query([{"role": "user", "content": "test"}])
         assert exc.value.messages[0]["content"] == "cut off"
 
-    def test_format_observation_messages(self):
-        model = LitellmModel(model_name="gpt-4", observation_template="{{ output.output }}")
+    def test_format_observation_messages(self, obs_template_model):
         message = {"extra": {"actions": [{"command": "echo test", "tool_call_id": "call_1"}]}}
         outputs = [{"output": "test output", "returncode": 0}]
-        result = model.format_observation_messages(message, outputs)
+        result = obs_template_model.format_observation_messages(message, outputs)
         assert len(result) == 1
         assert result[0]["role"] == "tool"
         assert result[0]["tool_call_id"] == "call_1"
         assert result[0]["content"] == "test output"
 
-    def test_format_observation_messages_no_actions(self):
-        model = LitellmModel(model_name="gpt-4")
-        result = model.format_observation_messages({"extra": {}}, [])
-        assert result == []
+    def test_format_observation_messages_no_actions(self, litellm_gpt4):
+        assert litellm_gpt4.format_observation_messages({"extra": {}}, []) == []
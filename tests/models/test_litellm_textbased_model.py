@@ -1,6 +1,4 @@
 import json
-import tempfile
-from pathlib import Path
 from unittest.mock import Mock, patch
 
 import litellm
@@ -32,7 +30,7 @@ def test_authentication_error_enhanced_message():
         assert "You can permanently set your API key with `mini-extra config set KEY VALUE`." in str(exc_info.value)
 
 
-def test_model_registry_loading():
+def test_model_registry_loading(tmp_path):
     """Test that custom model registry is loaded and registered when provided."""
     model_costs = {
         "my-custom-model": {
@@ -44,21 +42,14 @@ def test_model_registry_loading():
         }
     }
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-        json.dump(model_costs, f)
-        registry_path = f.name
+    registry_path = tmp_path / "registry.json"
+    registry_path.write_text(json.dumps(model_costs))
 
-    try:
-        with patch("litellm.utils.register_model") as mock_register:
-            _model = LitellmTextbasedModel(model_name="my-custom-model", litellm_model_registry=Path(registry_path))
+    with patch("litellm.utils.register_model") as mock_register:
+        _model = LitellmTextbasedModel(model_name="my-custom-model", litellm_model_registry=registry_path)
 
-            # Verify register_model was called with the correct data
-            mock_register.assert_called_once_with(model_costs)
-    except Exception as e:
-        print(e)
-        raise e
-    finally:
-        Path(registry_path).unlink()
+        # Verify register_model was called with the correct data
+        mock_register.assert_called_once_with(model_costs)
 
 
 def test_model_registry_none():
@@ -79,48 +70,37 @@ def test_model_registry_not_provided():
         mock_register.assert_not_called()
 
 
+# litellm's mock_response builds a Message with fewer fields than its ModelResponse schema declares,
+# so response.model_dump() warns; these tests don't look at the dumped response
+_IGNORE_MOCK_RESPONSE_SERIALIZER_WARNING = pytest.mark.filterwarnings("ignore:Pydantic serializer warnings:UserWarning")
+
+
+@_IGNORE_MOCK_RESPONSE_SERIALIZER_WARNING
 def test_litellm_model_cost_tracking_ignore_errors():
     """Test that models work with cost_tracking='ignore_errors'."""
-    model = LitellmTextbasedModel(model_name="gpt-4o", cost_tracking="ignore_errors")
+    content = "```mswea_bash_command\necho test\n```"
+    model = LitellmTextbasedModel(
+        model_name="gpt-4o", cost_tracking="ignore_errors", model_kwargs={"mock_response": content}
+    )
 
     initial_cost = GLOBAL_MODEL_STATS.cost
 
-    with patch("litellm.completion") as mock_completion:
-        mock_response = Mock()
-        mock_message = Mock()
-        mock_message.content = "```mswea_bash_command\necho test\n```"
-        mock_message.model_dump.return_value = {
-            "role": "assistant",
-            "content": "```mswea_bash_command\necho test\n```",
-        }
-        mock_response.choices = [Mock(message=mock_message)]
-        mock_response.model_dump.return_value = {"test": "response"}
-        mock_completion.return_value = mock_response
-
-        with patch("litellm.cost_calculator.completion_cost", side_effect=ValueError("Model not found")):
-            messages = [{"role": "user", "content": "test"}]
-            result = model.query(messages)
+    with patch("litellm.cost_calculator.completion_cost", side_effect=ValueError("Model not found")):
+        result = model.query([{"role": "user", "content": "test"}])
 
-            assert result["content"] == "```mswea_bash_command\necho test\n```"
-            assert result["extra"]["actions"] == [{"command": "echo test"}]
-            assert GLOBAL_MODEL_STATS.cost == initial_cost
+    assert result["content"] == content
+    assert result["extra"]["actions"] == [{"command": "echo test"}]
+    assert GLOBAL_MODEL_STATS.cost == initial_cost
 
 
+@_IGNORE_MOCK_RESPONSE_SERIALIZER_WARNING
 def test_litellm_model_cost_validation_zero_cost():
     """Test that zero cost raises error when cost tracking is enabled."""
-    model = LitellmTextbasedModel(model_name="gpt-4o")
-
-    with patch("litellm.completion") as mock_completion:
-        mock_response = Mock()
-        mock_response.choices = [Mock(message=Mock(content="Test response"))]
-        mock_response.model_dump.return_value = {"test": "response"}
-        mock_completion.return_value = mock_response
-
-        with patch("litellm.cost_calculator.completion_cost", return_value=0.0):
-            messages = [{"role": "user", "content": "test"}]
+    model = LitellmTextbasedModel(model_name="gpt-4o", model_kwargs={"mock_response": "Test response"})
 
-            with pytest.raises(RuntimeError) as exc_info:
-                model.query(messages)
+    with patch("litellm.cost_calculator.completion_cost", return_value=0.0):
+        with pytest.raises(RuntimeError) as exc_info:
+            model.query([{"role": "user", "content": "test"}])
 
-            assert "Cost must be > 0.0, got 0.0" in str(exc_info.value)
-            assert "MSWEA_COST_TRACKING='ignore_errors'" in str(exc_info.value)
+    assert "Cost must be > 0.0, got 0.0" in str(exc_info.value)
+    assert "MSWEA_COST_TRACKING='ignore_errors'" in str(exc_info.value)
@@ -1,5 +1,4 @@
 import json
-import os
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -9,14 +8,6 @@ from minisweagent.models.portkey_model import PortkeyModel, PortkeyModelConfig
 from minisweagent.models.utils.actions_toolcall import BASH_TOOL
 
 
-def test_portkey_model_missing_api_key():
-    """Test that PortkeyModel raises ValueError when no API key is provided."""
-    with patch("minisweagent.models.portkey_model.Portkey"):
-        with patch.dict(os.environ, {}, clear=True):
-            with pytest.raises(ValueError, match="Portkey API key is required"):
-                PortkeyModel(model_name="gpt-4o")
-
-
 def test_portkey_model_config():
     """Test PortkeyModelConfig creation."""
     config = PortkeyModelConfig(model_name="gpt-4o", model_kwargs={"temperature": 0.7})
@@ -24,24 +15,37 @@ def test_portkey_model_config():
     assert config.model_kwargs == {"temperature": 0.7}
 
 
-def test_portkey_model_initialization():
-    """Test PortkeyModel initialization with mocked Portkey."""
+@pytest.mark.parametrize(
+    ("env", "client_kwargs"),
+    [
+        ({}, None),
+        ({"PORTKEY_API_KEY": "test-key"}, {"api_key": "test-key"}),
+        (
+            {"PORTKEY_API_KEY": "test-key", "PORTKEY_VIRTUAL_KEY": "test-virtual"},
+            {"api_key": "test-key", "virtual_key": "test-virtual"},
+        ),
+    ],
+    ids=["missing_api_key", "api_key", "virtual_key"],
+)
+def test_portkey_model_initialization(monkeypatch, env, client_kwargs):
+    """Test that PortkeyModel requires an API key and passes the env keys on to the Portkey client."""
+    for key in ("PORTKEY_API_KEY", "PORTKEY_VIRTUAL_KEY"):
+        monkeypatch.delenv(key, raising=False)
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
     mock_portkey_class = MagicMock()
-    mock_client = MagicMock()
-    mock_portkey_class.return_value = mock_client
-
-    with patch("minisweagent.models.portkey_model.Portkey", mock_portkey_class):
-        with patch.dict(os.environ, {"PORTKEY_API_KEY": "test-key", "PORTKEY_VIRTUAL_KEY": "test-virtual"}):
-            model = PortkeyModel(model_name="gpt-4o")
-
-            assert model.config.model_name == "gpt-4o"
-
-            # Verify Portkey was called with correct parameters
-            mock_portkey_class.assert_called_once_with(api_key="test-key", virtual_key="test-virtual")
+    monkeypatch.setattr("minisweagent.models.portkey_model.Portkey", mock_portkey_class)
+    if client_kwargs is None:
+        with pytest.raises(ValueError, match="Portkey API key is required"):
+            PortkeyModel(model_name="gpt-4o")
+        return
+    assert PortkeyModel(model_name="gpt-4o").config.model_name == "gpt-4o"
+    mock_portkey_class.assert_called_once_with(**client_kwargs)
 
 
-def test_portkey_model_query():
+def test_portkey_model_query(monkeypatch):
     """Test PortkeyModel.query method with mocked response."""
+    monkeypatch.setenv("PORTKEY_API_KEY", "test-key")
     mock_portkey_class = MagicMock()
     mock_client = MagicMock()
     mock_response = MagicMock()
@@ -68,45 +72,42 @@ def test_portkey_model_query():
     mock_portkey_class.return_value = mock_client
 
     with patch("minisweagent.models.portkey_model.Portkey", mock_portkey_class):
-        with patch.dict(os.environ, {"PORTKEY_API_KEY": "test-key"}):
-            with patch("minisweagent.models.portkey_model.litellm.cost_calculator.completion_cost") as mock_cost:
-                mock_cost.return_value = 0.01
-
-                model = PortkeyModel(model_name="gpt-4o")
+        with patch.object(PortkeyModel, "_calculate_cost", return_value={"cost": 0.01}) as mock_cost:
+            model = PortkeyModel(model_name="gpt-4o")
 
-                messages = [{"role": "user", "content": "Hello!"}]
-                result = model.query(messages)
+            messages = [{"role": "user", "content": "Hello!"}]
+            result = model.query(messages)
 
-                assert result["extra"]["actions"] == [{"command": "echo 'Hello!'", "tool_call_id": "call_123"}]
-                assert result["extra"]["response"] == {"test": "response"}
-                assert result["extra"]["cost"] == 0.01
+            assert result["extra"]["actions"] == [{"command": "echo 'Hello!'", "tool_call_id": "call_123"}]
+            assert result["extra"]["response"] == {"test": "response"}
+            assert result["extra"]["cost"] == 0.01
 
-                # Verify the API was called correctly with tools
-                mock_client.chat.completions.create.assert_called_once_with(
-                    model="gpt-4o", messages=messages, tools=[BASH_TOOL]
-                )
-                # Verify cost calculation was called
-                mock_cost.assert_called_once_with(mock_response.model_copy(), model=None)
+            # Verify the API was called correctly with tools
+            mock_client.chat.completions.create.assert_called_once_with(
+                model="gpt-4o", messages=messages, tools=[BASH_TOOL]
+            )
+            mock_cost.assert_called_once_with(mock_response)
 
 
-def test_portkey_model_get_template_vars():
+def test_portkey_model_get_template_vars(monkeypatch):
     """Test PortkeyModel.get_template_vars method."""
+    monkeypatch.setenv("PORTKEY_API_KEY", "test-key")
     mock_portkey_class = MagicMock()
     mock_client = MagicMock()
     mock_portkey_class.return_value = mock_client
 
     with patch("minisweagent.models.portkey_model.Portkey", mock_portkey_class):
-        with patch.dict(os.environ, {"PORTKEY_API_KEY": "test-key"}):
-            model = PortkeyModel(model_name="gpt-4o", model_kwargs={"temperature": 0.7})
+        model = PortkeyModel(model_name="gpt-4o", model_kwargs={"temperature": 0.7})
 
-            template_vars = model.get_template_vars()
+        template_vars = model.get_template_vars()
 
-            assert template_vars["model_name"] == "gpt-4o"
-            assert template_vars["model_kwargs"] == {"temperature": 0.7}
+        assert template_vars["model_name"] == "gpt-4o"
+        assert template_vars["model_kwargs"] == {"temperature": 0.7}
 
 
-def test_portkey_model_cost_tracking_ignore_errors():
+def test_portkey_model_cost_tracking_ignore_errors(monkeypatch):
     """Test that models work with cost_tracking='ignore_errors'."""
+    monkeypatch.setenv("PORTKEY_API_KEY", "test-key")
     mock_portkey_class = MagicMock()
     mock_client = MagicMock()
     mock_response = MagicMock()
@@ -133,25 +134,25 @@ def test_portkey_model_cost_tracking_ignore_errors():
     mock_portkey_class.return_value = mock_client
 
     with patch("minisweagent.models.portkey_model.Portkey", mock_portkey_class):
-        with patch.dict(os.environ, {"PORTKEY_API_KEY": "test-key"}):
-            model = PortkeyModel(model_name="gpt-4o", cost_tracking="ignore_errors")
+        model = PortkeyModel(model_name="gpt-4o", cost_tracking="ignore_errors")
 
-            initial_cost = GLOBAL_MODEL_STATS.cost
+        initial_cost = GLOBAL_MODEL_STATS.cost
 
-            with patch(
-                "minisweagent.models.portkey_model.litellm.cost_calculator.completion_cost",
-                side_effect=ValueError("Model not found"),
-            ):
-                messages = [{"role": "user", "content": "test"}]
-                result = model.query(messages)
+        with patch(
+            "minisweagent.models.portkey_model.litellm.cost_calculator.completion_cost",
+            side_effect=ValueError("Model not found"),
+        ):
+            messages = [{"role": "user", "content": "test"}]
+            result = model.query(messages)
 
-                assert result["extra"]["actions"] == [{"command": "echo test", "tool_call_id": "call_456"}]
-                assert result["extra"]["cost"] == 0.0
-                assert GLOBAL_MODEL_STATS.cost == initial_cost
+            assert result["extra"]["actions"] == [{"command": "echo test", "tool_call_id": "call_456"}]
+            assert result["extra"]["cost"] == 0.0
+            assert GLOBAL_MODEL_STATS.cost == initial_cost
 
 
-def test_portkey_model_cost_validation_error():
+def test_portkey_model_cost_validation_error(monkeypatch):
     """Test that cost calculation errors raise RuntimeError when cost tracking is enabled."""
+    monkeypatch.setenv("PORTKEY_API_KEY", "test-key")
     mock_portkey_class = MagicMock()
     mock_client = MagicMock()
     mock_response = MagicMock()
@@ -178,16 +179,15 @@ def test_portkey_model_cost_validation_error():
     mock_portkey_class.return_value = mock_client
 
     with patch("minisweagent.models.portkey_model.Portkey", mock_portkey_class):
-        with patch.dict(os.environ, {"PORTKEY_API_KEY": "test-key"}):
-            model = PortkeyModel(model_name="gpt-4o")
+        model = PortkeyModel(model_name="gpt-4o")
 
-            with patch("minisweagent.models.portkey_model.litellm.cost_calculator.completion_cost") as mock_cost:
-                mock_cost.side_effect = ValueError("Model not found")
+        with patch("minisweagent.models.portkey_model.litellm.cost_calculator.completion_cost") as mock_cost:
+            mock_cost.side_effect = ValueError("Model not found")
 
-                messages = [{"role": "user", "content": "test"}]
+            messages = [{"role": "user", "content": "test"}]
 
-                with pytest.raises(RuntimeError) as exc_info:
-                    model.query(messages)
+            with pytest.raises(RuntimeError) as exc_info:
+                model.query(messages)
 
-                assert "Error calculating cost" in str(exc_info.value)
-                assert "MSWEA_COST_TRACKING='ignore_errors'" in str(exc_info.value)
+            assert "Error calculating cost" in str(exc_info.value)
+            assert "MSWEA_COST_TRACKING='ignore_errors'" in str(exc_info.value)
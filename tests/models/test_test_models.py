@@ -1,5 +1,4 @@
 import logging
-import time
 
 import pytest
 
@@ -61,6 +60,18 @@ def test_custom_cost_and_multiple_models(reset_global_stats):
     assert minisweagent.models.GLOBAL_MODEL_STATS.n_calls == 2
 
 
+def test_output_cost_overrides_cost_per_call(reset_global_stats):
+    """Test that a cost set on an output is reported and charged instead of the model's cost_per_call."""
+    model = DeterministicModel(
+        outputs=[make_output("echo a", [], cost=0.25), make_output("echo b", [])], cost_per_call=2.0
+    )
+
+    assert model.query([{"role": "user", "content": "test"}])["extra"]["cost"] == 0.25
+    assert minisweagent.models.GLOBAL_MODEL_STATS.cost == 0.25
+    assert model.query([{"role": "user", "content": "test"}])["extra"]["cost"] == 2.0
+    assert minisweagent.models.GLOBAL_MODEL_STATS.cost == 2.25
+
+
 def test_config_dataclass():
     """Test DeterministicModelConfig with custom values."""
     config = DeterministicModelConfig(
@@ -74,7 +85,7 @@ def test_config_dataclass():
     assert model.config.cost_per_call == 5.0
 
 
-def test_sleep_and_warning_commands(caplog):
+def test_sleep_and_warning_commands(caplog, monkeypatch):
     """Test special /sleep and /warning command handling."""
     # Test sleep command - processes sleep then returns actual output (counts as 1 call)
     model = DeterministicModel(
@@ -83,10 +94,11 @@ def test_sleep_and_warning_commands(caplog):
             make_output("```mswea_bash_command\necho after_sleep\n```", [{"command": "echo after_sleep"}]),
         ]
     )
-    start_time = time.time()
+    sleeps = []
+    monkeypatch.setattr("minisweagent.models.test_models.time.sleep", sleeps.append)
     result = model.query([{"role": "user", "content": "test"}])
     assert result["content"] == "```mswea_bash_command\necho after_sleep\n```"
-    assert time.time() - start_time >= 0.1
+    assert sleeps == [0.1]
 
     # Test warning command - processes warning then returns actual output (counts as 1 call)
     model2 = DeterministicModel(
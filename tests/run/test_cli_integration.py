@@ -1,11 +1,12 @@
 import re
 import subprocess
 import sys
-from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
 
+from minisweagent.config import builtin_config_dir
+from minisweagent.models.test_models import DeterministicModel, make_output
 from minisweagent.run.mini import DEFAULT_CONFIG_FILE, app, main
 
 
@@ -566,68 +567,22 @@ def test_output_file_is_created(tmp_path):
 
     output_file = tmp_path / "test_traj.json"
 
-    # Create a temporary config file
-    config_file = tmp_path / "test_config.yaml"
-    default_config_path = Path("src/minisweagent/config/default.yaml")
-    config_file.write_text(default_config_path.read_text())
+    # A real deterministic model and the real local environment, which submits on the first action
+    model = DeterministicModel(
+        outputs=[
+            make_output(
+                "```mswea_bash_command\necho COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT\necho done\n```",
+                [{"command": "echo COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT\necho done"}],
+            )
+        ]
+    )
 
     with (
         patch("minisweagent.run.mini.configure_if_first_time"),
-        patch("minisweagent.run.mini.get_model") as mock_get_model,
-        patch("minisweagent.run.mini.get_environment") as mock_get_env,
+        patch("minisweagent.run.mini.get_model", return_value=model),
         patch("minisweagent.agents.utils.prompt_user.prompt_session.prompt", return_value=""),
         patch("minisweagent.agents.utils.prompt_user._multiline_prompt_session.prompt", return_value=""),
     ):
-        # Setup mocks
-        mock_model = Mock()
-        mock_model.config = Mock()
-        mock_model.config.model_dump.return_value = {}
-        mock_model.serialize.return_value = {
-            "info": {
-                "config": {"model": {}, "model_type": "MockModel"},
-            }
-        }
-        mock_model.get_template_vars.return_value = {}
-        mock_model.format_message.side_effect = lambda **kwargs: dict(**kwargs)
-        # query now returns dict with extra["actions"]
-        mock_model.query.side_effect = [
-            {
-                "role": "assistant",
-                "content": "```mswea_bash_command\necho COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT\necho done\n```",
-                "extra": {"actions": [{"command": "echo COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT\necho done"}]},
-            },
-        ]
-        # format_observation_messages returns observation messages
-        mock_model.format_observation_messages.return_value = []
-        mock_get_model.return_value = mock_model
-
-        # Environment execute raises Submitted when COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT is seen
-        from minisweagent.exceptions import Submitted
-
-        def execute_side_effect(action):
-            raise Submitted(
-                {
-                    "role": "exit",
-                    "content": "done",
-                    "extra": {"exit_status": "Submitted", "submission": "done"},
-                }
-            )
-
-        mock_environment = Mock()
-        mock_environment.config = Mock()
-        mock_environment.config.model_dump.return_value = {}
-        mock_environment.execute.side_effect = execute_side_effect
-        mock_environment.get_template_vars.return_value = {
-            "system": "TestOS",
-            "release": "1.0",
-            "version": "1.0.0",
-            "machine": "x86_64",
-        }
-        mock_environment.serialize.return_value = {
-            "info": {"config": {"environment": {}, "environment_type": "MockEnvironment"}}
-        }
-        mock_get_env.return_value = mock_environment
-
         runner = CliRunner()
         result = runner.invoke(
             app,
@@ -639,7 +594,7 @@ def test_output_file_is_created(tmp_path):
                 "--output",
                 str(output_file),
                 "--config",
-                str(config_file),
+                str(builtin_config_dir / "default.yaml"),
             ],
         )
 
@@ -10,22 +10,12 @@ from minisweagent.run.utilities.inspector import TrajectoryInspector, main
 
 
 def get_screen_text(app: TrajectoryInspector) -> str:
-    """Extract all text content from the app's UI."""
-    text_parts = []
-
-    def _append_visible_static_text(container):
-        for static_widget in container.query("Static"):
-            if static_widget.display:
-                if hasattr(static_widget, "content") and static_widget.content:  # type: ignore[attr-defined]
-                    text_parts.append(str(static_widget.content))  # type: ignore[attr-defined]
-                elif hasattr(static_widget, "renderable") and static_widget.renderable:  # type: ignore[attr-defined]
-                    text_parts.append(str(static_widget.renderable))  # type: ignore[attr-defined]
-
-    # Get all Static widgets in the main content container
-    content_container = app.query_one("#content")
-    _append_visible_static_text(content_container)
-
-    return "\n".join(text_parts)
+    """Extract the text of all visible Static widgets in the main content container."""
+    return "\n".join(
+        str(text)
+        for widget in app.query_one("#content").query("Static")
+        if widget.display and (text := getattr(widget, "content", None) or getattr(widget, "renderable", None))
+    )
 
 
 @pytest.fixture
@@ -127,7 +117,7 @@ async def test_trajectory_inspector_basic_navigation(temp_trajectory_files):
 
     async with app.run_test() as pilot:
         # Should start with first trajectory, first step
-        await pilot.pause(0.1)
+        await pilot.pause()
         assert "Trajectory 1/2 - simple.traj.json - Step 1/3" in app.title
         content = get_screen_text(app)
         assert "SYSTEM" in content
@@ -137,14 +127,16 @@ async def test_trajectory_inspector_basic_navigation(temp_trajectory_files):
         # Navigate to next step
         await pilot.press("l")
         assert "Step 2/3" in app.title
-        assert "ASSISTANT" in get_screen_text(app)
-        assert "I'll help you solve this" in get_screen_text(app)
+        content = get_screen_text(app)
+        assert "ASSISTANT" in content
+        assert "I'll help you solve this" in content
 
         # Navigate to last step
         await pilot.press("$")
         assert "Step 3/3" in app.title
-        assert "ASSISTANT" in get_screen_text(app)
-        assert "echo COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT" in get_screen_text(app)
+        content = get_screen_text(app)
+        assert "ASSISTANT" in content
+        assert "echo COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT" in content
 
         # Navigate back to first step
         await pilot.press("0")
@@ -166,7 +158,7 @@ async def test_trajectory_inspector_trajectory_navigation(temp_trajectory_files)
     app = TrajectoryInspector(valid_files)
 
     async with app.run_test() as pilot:
-        await pilot.pause(0.1)
+        await pilot.pause()
 
         # Should start with first trajectory
         assert "Trajectory 1/2 - simple.traj.json" in app.title
@@ -176,7 +168,7 @@ async def test_trajectory_inspector_trajectory_navigation(temp_trajectory_files)
         # Navigate to next trajectory
         await pilot.press("L")
         assert "Trajectory 2/2 - swebench.traj.json" in app.title
-        await pilot.pause(0.1)
+        await pilot.pause()
         content = get_screen_text(app)
         assert "You are a helpful assistant" in content
 
@@ -203,7 +195,7 @@ async def test_trajectory_inspector_swebench_format(temp_trajectory_files):
     async with app.run_test() as pilot:
         # Navigate to SWEBench trajectory
         await pilot.press("L")
-        await pilot.pause(0.1)
+        await pilot.pause()
 
         assert "Trajectory 2/2 - swebench.traj.json" in app.title
         assert "Step 1/3" in app.title
@@ -221,7 +213,7 @@ async def test_trajectory_inspector_scrolling(temp_trajectory_files):
     app = TrajectoryInspector(valid_files)
 
     async with app.run_test() as pilot:
-        await pilot.pause(0.1)
+        await pilot.pause()
 
         # Test scrolling
         vs = app.query_one("VerticalScroll")
@@ -240,7 +232,7 @@ async def test_trajectory_inspector_empty_trajectory():
     app = TrajectoryInspector([])
 
     async with app.run_test() as pilot:
-        await pilot.pause(0.1)
+        await pilot.pause()
 
         assert "Trajectory Inspector - No Data" in app.title
         assert "No trajectory loaded" in get_screen_text(app)
@@ -355,11 +347,11 @@ async def test_trajectory_inspector_quit_binding(temp_trajectory_files):
     app = TrajectoryInspector(valid_files)
 
     async with app.run_test() as pilot:
-        await pilot.pause(0.1)
+        await pilot.pause()
 
         # Test quit functionality
         await pilot.press("q")
-        await pilot.pause(0.1)
+        await pilot.pause()
 
         # App should exit gracefully (the test framework handles this)
 
@@ -399,18 +391,18 @@ async def test_trajectory_inspector_reasoning_display(sample_reasoning_trajector
 
         app = TrajectoryInspector([f], show_reasoning=True)
         async with app.run_test() as pilot:
-            await pilot.pause(0.1)
+            await pilot.pause()
             await pilot.press("l")  # step with assistant message
-            await pilot.pause(0.1)
+            await pilot.pause()
             content = get_screen_text(app)
             assert "REASONING" in content
             assert "Let me think..." in content
 
         app2 = TrajectoryInspector([f], show_reasoning=False)
         async with app2.run_test() as pilot:
-            await pilot.pause(0.1)
+            await pilot.pause()
             await pilot.press("l")
-            await pilot.pause(0.1)
+            await pilot.pause()
             assert "REASONING" not in get_screen_text(app2)
 
 
@@ -423,9 +415,9 @@ async def test_trajectory_inspector_toggle_reasoning(sample_reasoning_trajectory
 
         app = TrajectoryInspector([f])
         async with app.run_test() as pilot:
-            await pilot.pause(0.1)
+            await pilot.pause()
             await pilot.press("l")
-            await pilot.pause(0.1)
+            await pilot.pause()
             assert "REASONING" in get_screen_text(app)
 
             await pilot.press("r")  # toggle off
@@ -444,7 +436,7 @@ async def test_trajectory_inspector_reload(sample_simple_trajectory):
 
         app = TrajectoryInspector([f])
         async with app.run_test() as pilot:
-            await pilot.pause(0.1)
+            await pilot.pause()
             await pilot.press("l")  # go to step 2
             assert "Step 2/3" in app.title
 
@@ -458,7 +450,7 @@ async def test_trajectory_inspector_reload(sample_simple_trajectory):
                 )
             )
             await pilot.press("R")
-            await pilot.pause(0.1)
+            await pilot.pause()
             assert "Step 2/4" in app.title
 
 
@@ -471,13 +463,13 @@ async def test_trajectory_inspector_reload_clamps_step(sample_simple_trajectory)
 
         app = TrajectoryInspector([f])
         async with app.run_test() as pilot:
-            await pilot.pause(0.1)
+            await pilot.pause()
             await pilot.press("$")  # go to last step (3/3)
             assert "Step 3/3" in app.title
 
             f.write_text(json.dumps(sample_simple_trajectory[:2]))
             await pilot.press("R")
-            await pilot.pause(0.1)
+            await pilot.pause()
             assert "Step 1/1" in app.title
 
 
@@ -511,10 +503,10 @@ async def test_trajectory_inspector_ansi_content(sample_ansi_trajectory):
         traj_file.write_text(json.dumps(sample_ansi_trajectory))
         app = TrajectoryInspector([traj_file])
         async with app.run_test() as pilot:
-            await pilot.pause(0.1)
+            await pilot.pause()
             # Navigate to step with ANSI content
             await pilot.press("l")
-            await pilot.pause(0.1)
+            await pilot.pause()
             content = get_screen_text(app)
             assert "Done" in content
             assert "\x1b" not in content
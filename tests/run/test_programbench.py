@@ -1,7 +1,8 @@
 """Integration tests for the programbench runner.
 
 These tests exercise the real ``tar -czf`` + ``docker cp`` flow inside a live
-container. They require a working ``docker``/``podman`` (skipped otherwise).
+container. They require a working ``docker``/``podman`` (skipped otherwise),
+except for the ``ProgramBenchAgent`` trajectory test, which runs locally.
 
 The ``main()`` orchestration tests additionally require the real ``programbench``
 package to be installed so we verify API compatibility with what programbench
@@ -18,8 +19,11 @@ from pydantic import BaseModel
 
 from minisweagent import package_dir
 from minisweagent.environments.docker import DockerEnvironment
+from minisweagent.environments.local import LocalEnvironment
 from minisweagent.exceptions import Submitted
-from minisweagent.run.benchmarks.programbench import copy_submission, main
+from minisweagent.models.test_models import DeterministicModel, make_output
+from minisweagent.run.benchmarks.programbench import ProgramBenchAgent, copy_submission, main
+from minisweagent.run.benchmarks.utils.batch_progress import RunBatchProgressManager
 
 # Lightweight image used for the real-docker tests. Already cached on machines
 # that run mini-swe-agent's docker test suite (see tests/environments/test_docker.py).
@@ -89,6 +93,44 @@ def test_copy_submission_rejects_non_docker_env(tmp_path):
         copy_submission(env, tmp_path / "submission.tar.gz")
 
 
+# ---------------------------------------------------------------------------
+# ProgramBenchAgent: raw_output is dropped from the history and the trajectory
+# ---------------------------------------------------------------------------
+
+
+def test_agent_drops_raw_output(tmp_path, default_config):
+    """raw_output is dropped from agent.messages and the saved trajectory; the other fields are kept."""
+    output_path = tmp_path / "traj.json"
+    progress_manager = RunBatchProgressManager(num_instances=1)
+    progress_manager.on_instance_start("test")
+    agent = ProgramBenchAgent(
+        DeterministicModel(
+            outputs=[
+                make_output("Step 1", [{"command": "echo hello"}]),
+                make_output("Done", [{"command": "echo COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT\necho finished"}]),
+            ],
+            cost_per_call=0.0,
+        ),
+        LocalEnvironment(),
+        progress_manager=progress_manager,
+        instance_id="test",
+        output_path=output_path,
+        **default_config,
+    )
+    agent.run("Test task")
+
+    observations = [msg for msg in agent.messages if msg["role"] == "user" and "returncode" in msg.get("extra", {})]
+    assert len(observations) == 1
+    assert "hello" in observations[0]["content"]
+    assert observations[0]["extra"]["returncode"] == 0
+    assert "timestamp" in observations[0]["extra"]
+    assert agent.messages[-1]["extra"]["exit_status"] == "Submitted"
+
+    saved_messages = json.loads(output_path.read_bytes())["messages"]
+    assert saved_messages == json.loads(json.dumps(agent.messages))
+    assert not any("raw_output" in msg.get("extra", {}) for msg in saved_messages)
+
+
 # ---------------------------------------------------------------------------
 # Network isolation: containers must not have internet access
 # ---------------------------------------------------------------------------
@@ -217,7 +259,7 @@ def test_programbench_end_to_end_real_docker(real_programbench_first_instance, t
         assert tf.getnames(), "submission tarball should not be empty"
 
     assert traj.exists()
-    data = json.loads(traj.read_text())
+    data = json.loads(traj.read_bytes())
     assert data["instance_id"] == iid
     assert data["info"]["exit_status"] == "Submitted"
 
@@ -14,55 +14,76 @@
 #   - May have rate limits and quotas                                          #
 #                                                                              #
 #   To run: pytest tests/test_fire.py -v --run-fire                            #
+#   Providers in parallel: add -n 4 --dist loadgroup                           #
 #   Only run when explicitly requested by a human operator.                    #
 #                                                                              #
 ################################################################################
 """
 
 import os
-import subprocess
-import sys
 
 import pytest
 
+from minisweagent.agents.default import DefaultAgent
+from minisweagent.run.mini import app
+
 
 def pytest_configure(config):
     """Register custom markers."""
     config.addinivalue_line("markers", "fire: mark test as a fire test (real API calls)")
 
 
-@pytest.fixture(autouse=True)
-def skip_without_fire_flag(request):
-    """Skip fire tests unless --run-fire is provided."""
-    if not request.config.getoption("--run-fire", default=False):
-        pytest.skip("Fire tests require --run-fire flag and cost real money")
+pytestmark = [
+    # Evaluated at collection time, so without --run-fire no fixture (or provider check) ever runs.
+    pytest.mark.skipif(
+        "not config.getoption('--run-fire')", reason="Fire tests require --run-fire flag and cost real money"
+    ),
+    # Runs are in-process, so bound them by wall-clock time (a stalled request is not capped by the cost limit)
+    pytest.mark.timeout(120),
+]
 
 
 SIMPLE_TASK = "Your job is to run `ls`, verify that you see files, then quit."
 
-requires_openai = pytest.mark.skipif(not os.environ.get("OPENAI_API_KEY"), reason="OPENAI_API_KEY not set")
-requires_openrouter = pytest.mark.skipif(not os.environ.get("OPENROUTER_API_KEY"), reason="OPENROUTER_API_KEY not set")
-requires_portkey = pytest.mark.skipif(not os.environ.get("PORTKEY_API_KEY"), reason="PORTKEY_API_KEY not set")
-requires_requesty = pytest.mark.skipif(not os.environ.get("REQUESTY_API_KEY"), reason="REQUESTY_API_KEY not set")
-
-
-def run_mini_command(extra_options: list[str]) -> subprocess.CompletedProcess:
-    """Run the mini command with the given extra options."""
-    cmd = [
-        sys.executable,
-        "-m",
-        "minisweagent",
-        "--exit-immediately",
-        "-y",
-        "--cost-limit",
-        "0.03",
-        "-t",
-        SIMPLE_TASK,
-        *extra_options,
-    ]
-    env = os.environ.copy()
-    env["MSWEA_MODEL_RETRY_STOP_AFTER_ATTEMPT"] = "8"
-    return subprocess.run(cmd, timeout=120, env=env)
+
+def _requires_provider(provider: str, key: str, *, timeout: int):
+    """Skip unless `key` is set; group by provider so `--dist loadgroup` keeps each provider on one worker.
+    `timeout` (seconds) tightens the module-wide limit so that a hanging provider fails fast.
+    """
+
+    def decorate(func):
+        func = pytest.mark.timeout(timeout)(func)
+        func = pytest.mark.xdist_group(provider)(func)
+        return pytest.mark.skipif(not os.environ.get(key), reason=f"{key} not set")(func)
+
+    return decorate
+
+
+# Direct API calls are quickest; the gateways add a hop (and their own retries) on top
+requires_openai = _requires_provider("openai", "OPENAI_API_KEY", timeout=60)
+requires_openrouter = _requires_provider("openrouter", "OPENROUTER_API_KEY", timeout=90)
+requires_portkey = _requires_provider("portkey", "PORTKEY_API_KEY", timeout=90)
+requires_requesty = _requires_provider("requesty", "REQUESTY_API_KEY", timeout=90)
+
+
+@pytest.fixture
+def run_mini_command(monkeypatch, reset_global_stats):
+    """Run the mini CLI in-process with the given extra options and check that the agent finished cleanly.
+    Global model stats are reset so that a global cost/call limit applies per test, as with separate processes.
+    """
+    monkeypatch.setenv("MSWEA_MODEL_RETRY_STOP_AFTER_ATTEMPT", "8")
+
+    def run(extra_options: list[str]) -> DefaultAgent:
+        args = ["--exit-immediately", "-y", "--cost-limit", "0.03", "-t", SIMPLE_TASK, *extra_options]
+        agent = app(args, standalone_mode=False)
+        # Without standalone mode, a typer.Exit comes back as its exit code instead of the agent
+        assert isinstance(agent, DefaultAgent), f"CLI exited with {agent!r}"
+        # Exceptions during the run (e.g., API errors) end up as the exit status instead of propagating
+        exit_status = agent.messages[-1]["extra"]["exit_status"]
+        assert exit_status in ("Submitted", "LimitsExceeded"), agent.messages[-1]["content"]
+        return agent
+
+    return run
 
 
 # =============================================================================
@@ -71,33 +92,27 @@ def run_mini_command(extra_options: list[str]) -> subprocess.CompletedProcess:
 
 
 @requires_openai
-def test_litellm_textbased():
+def test_litellm_textbased(run_mini_command):
     """Test with litellm_textbased model class."""
-    result = run_mini_command(
-        ["--model", "openai/gpt-5-mini", "--model-class", "litellm_textbased", "-c", "mini_textbased"]
-    )
-    assert result.returncode == 0
+    run_mini_command(["--model", "openai/gpt-5-mini", "--model-class", "litellm_textbased", "-c", "mini_textbased"])
 
 
 @requires_openai
-def test_litellm_toolcall():
+def test_litellm_toolcall(run_mini_command):
     """Test with litellm_toolcall model class."""
-    result = run_mini_command(["--model", "openai/gpt-5.2"])
-    assert result.returncode == 0
+    run_mini_command(["--model", "openai/gpt-5.2"])
 
 
 @requires_openai
-def test_litellm_toolcall_explicit():
+def test_litellm_toolcall_explicit(run_mini_command):
     """Test with litellm_toolcall model class."""
-    result = run_mini_command(["--model", "openai/gpt-5.2", "--model-class", "litellm", "-c", "mini"])
-    assert result.returncode == 0
+    run_mini_command(["--model", "openai/gpt-5.2", "--model-class", "litellm", "-c", "mini"])
 
 
 @requires_openai
-def test_litellm_response_toolcall():
+def test_litellm_response_toolcall(run_mini_command):
     """Test with litellm_response_toolcall model class (OpenAI Responses API)."""
-    result = run_mini_command(["--model", "openai/gpt-5.2", "--model-class", "litellm_response"])
-    assert result.returncode == 0
+    run_mini_command(["--model", "openai/gpt-5.2", "--model-class", "litellm_response"])
 
 
 # =============================================================================
@@ -106,26 +121,23 @@ def test_litellm_response_toolcall():
 
 
 @requires_openrouter
-def test_openrouter_textbased():
+def test_openrouter_textbased(run_mini_command):
     """Test with openrouter_textbased model class."""
-    result = run_mini_command(
+    run_mini_command(
         ["--model", "anthropic/claude-sonnet-4", "--model-class", "openrouter_textbased", "-c", "mini_textbased"]
     )
-    assert result.returncode == 0
 
 
 @requires_openrouter
-def test_openrouter_toolcall():
+def test_openrouter_toolcall(run_mini_command):
     """Test with openrouter_toolcall model class."""
-    result = run_mini_command(["--model", "anthropic/claude-sonnet-4", "--model-class", "openrouter"])
-    assert result.returncode == 0
+    run_mini_command(["--model", "anthropic/claude-sonnet-4", "--model-class", "openrouter"])
 
 
 @requires_openrouter
-def test_openrouter_response_toolcall():
+def test_openrouter_response_toolcall(run_mini_command):
     """Test with openrouter_response_toolcall model class (OpenAI Responses API via OpenRouter)."""
-    result = run_mini_command(["--model", "openai/gpt-5.2", "--model-class", "openrouter_response"])
-    assert result.returncode == 0
+    run_mini_command(["--model", "openai/gpt-5.2", "--model-class", "openrouter_response"])
 
 
 # =============================================================================
@@ -134,17 +146,15 @@ def test_openrouter_response_toolcall():
 
 
 @requires_portkey
-def test_portkey_default():
+def test_portkey_default(run_mini_command):
     """Test with default portkey model class."""
-    result = run_mini_command(["--model", "@openai/gpt-5-mini", "--model-class", "portkey"])
-    assert result.returncode == 0
+    run_mini_command(["--model", "@openai/gpt-5-mini", "--model-class", "portkey"])
 
 
 @requires_portkey
-def test_portkey_response():
+def test_portkey_response(run_mini_command):
     """Test with portkey_response model class (OpenAI Responses API via Portkey)."""
-    result = run_mini_command(["--model", "@openai/gpt-5.2", "--model-class", "portkey_response"])
-    assert result.returncode == 0
+    run_mini_command(["--model", "@openai/gpt-5.2", "--model-class", "portkey_response"])
 
 
 # =============================================================================
@@ -153,7 +163,6 @@ def test_portkey_response():
 
 
 @requires_requesty
-def test_requesty():
+def test_requesty(run_mini_command):
     """Test with requesty model class."""
-    result = run_mini_command(["--model", "openai/gpt-5-mini", "--model-class", "requesty"])
-    assert result.returncode == 0
+    run_mini_command(["--model", "openai/gpt-5-mini", "--model-class", "requesty"])